@@ -1,98 +1,343 @@
 from pytube import extract
-from heapq import nlargest
+import heapq
 from youtube_transcript_api import YouTubeTranscriptApi
+import numpy as np
 import spacy
+import srsly
 from spacy.lang.en.stop_words import STOP_WORDS
+from spacy.attrs import LOWER, SENT_START
+from spacy.tokens import DocBin
 from string import punctuation
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from importlib.util import find_spec
+from itertools import groupby
+from operator import itemgetter
 import argparse
+import hashlib
 import sys
 import os
+import re
+import tempfile
+import threading
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 # Global variable to track mode
 STREAMLIT_MODE = False
 
-def load_nlp_model():
+# Pipeline components we never use - summarizing only needs tokens and
+# sentence boundaries, which the lightweight senter provides (it has its
+# own embedding layer, so the shared tok2vec can go with the parser)
+UNUSED_PIPES = ['tok2vec', 'tagger', 'parser', 'attribute_ruler', 'lemmatizer', 'ner']
+
+# Long transcripts are parsed as chunks of roughly this many characters,
+# batched through nlp.pipe()
+CHUNK_SIZE = 5000
+BATCH_SIZE = 32
+
+# Concurrent transcript downloads in batch mode
+FETCH_WORKERS = 8
+
+# Set lookups for the word frequency filter
+_STOP = frozenset(STOP_WORDS)
+_PUNCT = frozenset(punctuation)
+
+# Transcripts and parsed docs are cached here between runs
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'yt_summarizer')
+
+# Video ID in watch, youtu.be, embed and shorts URLs
+_VIDEO_ID_RE = re.compile(r'(?:v=|youtu\.be/|/embed/|/shorts/)([A-Za-z0-9_-]{11})')
+
+def _load_pipeline():
+    """Load en_core_web_sm as just the tokenizer and sentence segmenter"""
+    nlp = spacy.load('en_core_web_sm', exclude=UNUSED_PIPES)
+    nlp.enable_pipe('senter')
+    return nlp
+
+def load_nlp_model(verbose=True):
     """Load spacy model - works for both CLI and Streamlit"""
     try:
-        return spacy.load('en_core_web_sm')
+        return _load_pipeline()
     except OSError:
-        if not STREAMLIT_MODE:
+        if verbose and not STREAMLIT_MODE:
             print("Error: spaCy English model not found.")
             print("Please install it by running: python -m spacy download en_core_web_sm")
         return None
 
 def extract_video_id(url):
     """Extract video ID from YouTube URL"""
+    match = _VIDEO_ID_RE.search(url)
+    if match:
+        return match.group(1)
+    
+    # Fall back to pytube for any other URL formats
     try:
         return extract.video_id(url)
     except:
-        # Handle different URL formats
-        if 'youtube.com/watch?v=' in url:
-            return url.split('v=')[1].split('&')[0]
-        elif 'youtu.be/' in url:
-            return url.split('youtu.be/')[1].split('?')[0]
-        else:
-            return None
+        return None
+
+def _cache_path(filename):
+    """Path inside the cache directory, or None for unsafe names"""
+    if not re.fullmatch(r'[\w.-]+', filename):
+        return None
+    return os.path.join(CACHE_DIR, filename)
+
+def _write_cache(path, data):
+    """Best-effort write to the on-disk cache"""
+    if path is None:
+        return
+    tmp_path = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write to a temp file and rename it into place, so readers never
+        # see a partly written entry and an interrupted run leaves none
+        with tempfile.NamedTemporaryFile(dir=CACHE_DIR, delete=False) as f:
+            tmp_path = f.name
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+def _read_cached_cues(path):
+    """Caption cues from the cache, or None if missing or unreadable"""
+    if not path:
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            cues = tuple(cue for cue in f.read().split("\n") if cue)
+    except (OSError, UnicodeDecodeError):
+        return None
+    return cues or None
+
+@lru_cache(maxsize=128)
+def _load_transcript(video_id):
+    """Fetch caption cues, raising on failure so errors are not cached"""
+    path = _cache_path(f"{video_id}-cues.txt")
+    cues = _read_cached_cues(path)
+    if cues:
+        return cues
+    
+    transcript = YouTubeTranscriptApi.get_transcript(video_id)
+    cues = tuple(cue for cue in (elem["text"].replace("\n", " ").strip()
+                                 for elem in transcript) if cue)
+    if cues:
+        _write_cache(path, "\n".join(cues).encode('utf-8'))
+    return cues
 
 def get_video_transcript(video_id):
-    """Get transcript from YouTube video"""
+    """Get transcript from YouTube video as a sequence of caption cues"""
     try:
-        transcript = YouTubeTranscriptApi.get_transcript(video_id)
-        text = ""
-        for elem in transcript:
-            text = text + " " + elem["text"]
-        text = text.replace("\n", " ")
-        return text.strip()
+        return _load_transcript(video_id)
     except Exception as e:
         return None
 
-def summarize_text(text, nlp, summary_length=0.3):
-    """Summarize text using spaCy NLP"""
-    if not text.strip():
-        return "Error: No text to summarize"
-    
-    document = nlp(text)
-    
-    # Calculate word frequencies
-    word_frequencies = {}
-    for word in document:
-        word_text = word.text.lower()
-        if word_text not in list(STOP_WORDS) and word_text not in punctuation:
-            if word.text not in word_frequencies.keys():
-                word_frequencies[word.text] = 1
-            else:
-                word_frequencies[word.text] += 1
+def _doc_cache_path(video_id, nlp):
+    """Cache file for parsed docs, keyed by spaCy and model version"""
+    key = "-".join([spacy.__version__, nlp.meta['lang'], nlp.meta['name'],
+                    nlp.meta['version'], *nlp.pipe_names])
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+    return _cache_path(f"{video_id}-{digest}.docs")
+
+def load_cached_docs(video_id, nlp):
+    """Load previously parsed (docs, chunk texts), or None if not cached"""
+    path = _doc_cache_path(video_id, nlp)
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            data = srsly.msgpack_loads(f.read())
+        docs = list(DocBin().from_bytes(data['docs']).get_docs(nlp.vocab))
+        texts = list(data['texts'])
+    except Exception:
+        return None
+    if len(docs) != len(texts):
+        return None
+    return docs, texts
+
+def save_cached_docs(video_id, nlp, docs, texts):
+    """Persist parsed transcript chunks, with their text, for later runs"""
+    data = {'docs': DocBin(docs=docs).to_bytes(), 'texts': list(texts)}
+    _write_cache(_doc_cache_path(video_id, nlp), srsly.msgpack_dumps(data))
+
+def split_into_chunks(text, chunk_size=CHUNK_SIZE):
+    """Split text into chunks, breaking at sentence ends where possible"""
+    chunks = []
+    start = 0
+    while len(text) - start > chunk_size:
+        end = text.rfind('. ', start + 1, start + chunk_size)
+        if end != -1:
+            end += 1  # Keep the period with its sentence
+        else:
+            end = text.rfind(' ', start + 1, start + chunk_size)
+            if end == -1:
+                end = start + chunk_size
+        chunks.append(text[start:end].strip())
+        start = end
+    chunks.append(text[start:].strip())
+    return [chunk for chunk in chunks if chunk]
+
+def group_cues(cues, chunk_size=CHUNK_SIZE):
+    """Join caption cues into chunks, ending at a sentence end where possible"""
+    chunks = []
+    current = []
+    size = 0
+    for cue in cues:
+        cue = cue.strip()
+        if not cue:
+            continue
+        current.append(cue)
+        size += len(cue) + 1
+        if size >= chunk_size and (cue.endswith(('.', '?', '!')) or size >= 2 * chunk_size):
+            chunks.append(" ".join(current))
+            current = []
+            size = 0
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+def transcript_chunks(transcript):
+    """Chunks to parse for a transcript given as text or as caption cues"""
+    if isinstance(transcript, str):
+        return split_into_chunks(transcript)
+    return group_cues(transcript)
+
+def _score_sentences(token_ids, counts, scale, sent_starts, sent_ends):
+    """Sum the word counts of each sentence's tokens, scaled by 1/max count"""
+    scores = np.zeros(len(sent_starts), dtype=np.float32)
+    for i in range(len(sent_starts)):
+        total = 0
+        for j in range(sent_starts[i], sent_ends[i]):
+            total += counts[token_ids[j]]
+        scores[i] = total * scale
+    return scores
+
+def find_k_largest(k, scores):
+    """Indices of the k largest scores, kept in a size-k min-heap"""
+    # Negated indices make earlier sentences win ties, like nlargest()
+    heap = [(scores[i], -i) for i in range(k)]
+    heapq.heapify(heap)
+    for i in range(k, len(scores)):
+        if (scores[i], -i) > heap[0]:
+            heapq.heapreplace(heap, (scores[i], -i))
+    indices = np.empty(k, dtype=np.int64)
+    for j in range(k):
+        indices[j] = -heap[j][1]
+    return indices
+
+if njit is not None:
+    score_sentences = njit(cache=True)(_score_sentences)
+    find_k_largest = njit(cache=True)(find_k_largest)
+else:
+    def score_sentences(token_ids, counts, scale, sent_starts, sent_ends):
+        """NumPy fallback for when numba is not installed"""
+        totals = np.concatenate(([0], np.cumsum(counts[token_ids], dtype=np.int64)))
+        return ((totals[sent_ends] - totals[sent_starts]) * scale).astype(np.float32)
+
+def summarize_text(text, nlp, summary_length=0.3, n_process=1, video_id=None):
+    """Summarize text (a string or a list of caption cues) using spaCy NLP"""
+    # Reuse the parse from an earlier run when the video is known
+    cached = load_cached_docs(video_id, nlp) if video_id else None
+    if cached is not None:
+        docs, chunks = cached
+    else:
+        chunks = transcript_chunks(text)
+        if not chunks:
+            return "Error: No text to summarize"
+        docs = list(nlp.pipe(chunks, batch_size=BATCH_SIZE,
+                             n_process=n_process, disable=UNUSED_PIPES))
+        if video_id:
+            save_cached_docs(video_id, nlp, docs, chunks)
+    return summarize_docs(docs, summary_length, chunks)
+
+def summarize_docs(docs, summary_length=0.3, texts=None):
+    """Summarize the parsed chunks of a single transcript (texts: chunk strings)"""
+    if not docs:
+        return "Error: No meaningful words found in text"
     
-    if not word_frequencies:
+    # Calculate word frequencies keyed by each token's lowercase hash;
+    # token_ids maps every token to its word's slot
+    token_hashes = np.concatenate([document.to_array(LOWER) for document in docs])
+    word_hashes, token_ids, counts = np.unique(token_hashes, return_inverse=True,
+                                               return_counts=True)
+    strings = docs[0].vocab.strings
+    for i, word_hash in enumerate(word_hashes):
+        word = strings[int(word_hash)]
+        if word in _STOP or word in _PUNCT:
+            counts[i] = 0
+    
+    if not counts.any():
         return "Error: No meaningful words found in text"
     
-    # Normalize frequencies
-    max_frequency = max(word_frequencies.values())
-    for word in word_frequencies.keys():
-        word_frequencies[word] = word_frequencies[word] / max_frequency
+    # Pack counts as uint16 (no word repeats 65k times in a transcript);
+    # normalizing is a single scale applied to each sentence total
+    counts = np.minimum(counts, np.iinfo(np.uint16).max).astype(np.uint16)
+    scale = np.float32(1.0 / counts.max())
+    
+    # Sentences as (start, end) token offsets into the concatenated chunks,
+    # read from the sentence start flags rather than walking each Span
+    sentence_tokens = [sentence for document in docs for sentence in document.sents]
+    starts = []
+    sent_docs = []
+    offset = 0
+    for doc_index, document in enumerate(docs):
+        if len(document):
+            flags = document.to_array(SENT_START)
+            flags[0] = 1
+            doc_starts = np.flatnonzero(flags == 1)
+            starts.append(doc_starts + offset)
+            sent_docs.append(np.full(len(doc_starts), doc_index))
+        offset += len(document)
+    sent_starts = np.concatenate(starts).astype(np.int64)
+    sent_docs = np.concatenate(sent_docs)
+    sent_ends = np.append(sent_starts[1:], offset)
     
     # Score sentences
-    sentence_tokens = [sentence for sentence in document.sents]
-    sentence_score = {}
-    for sentence in sentence_tokens:
-        for word in sentence:
-            if word.text.lower() in word_frequencies.keys():
-                if sentence not in sentence_score.keys():
-                    sentence_score[sentence] = word_frequencies[word.text.lower()]
-                else:
-                    sentence_score[sentence] += word_frequencies[word.text.lower()]
+    scores = score_sentences(token_ids, counts, scale, sent_starts, sent_ends)
+    scored = np.flatnonzero(scores > 0)
     
-    if not sentence_score:
+    if not len(scored):
         return "Error: Could not score sentences"
     
     # Select top sentences
     select_length = max(1, int(len(sentence_tokens) * summary_length))
-    summary_sentences = nlargest(select_length, sentence_score, key=sentence_score.get)
-    final_summary = [sentence.text for sentence in summary_sentences]
+    candidates = scores[scored]
+    top = find_k_largest(min(select_length, len(scored)), candidates)
+    top.sort()
+    top = top[np.argsort(-candidates[top], kind='stable')]
+    # Slice sentences out of their chunk text by character offsets, which
+    # is cheaper than Span.text rebuilding them token by token
+    final_summary = []
+    for i in scored[top]:
+        sentence = sentence_tokens[i]
+        if texts:
+            text = texts[sent_docs[i]]
+            final_summary.append(text[sentence.start_char:sentence.end_char])
+        else:
+            final_summary.append(sentence.text)
     summary = ' '.join(final_summary)
     
     return summary, sentence_tokens
 
+# st.cache_resource wrapper around _load_pipeline, created on first use so
+# the CLI never has to import streamlit
+_cached_nlp = None
+
+def load_nlp_cached():
+    """Load the spaCy model once per Streamlit server"""
+    global _cached_nlp
+    if _cached_nlp is None:
+        import streamlit as st
+        _cached_nlp = st.cache_resource(_load_pipeline)
+    return _cached_nlp()
+
 def summarize_youtube_video_streamlit(url, summary_length=0.3):
     """Main function to summarize YouTube video for Streamlit"""
     try:
@@ -107,14 +352,8 @@ def summarize_youtube_video_streamlit(url, summary_length=0.3):
             return "Error: No transcript found for this video"
         
         # Load NLP model with Streamlit caching
-        import streamlit as st
-        
-        @st.cache_resource
-        def load_nlp_cached():
-            return spacy.load('en_core_web_sm')
-        
         nlp = load_nlp_cached()
-        result = summarize_text(text, nlp, summary_length)
+        result = summarize_text(text, nlp, summary_length, video_id=video_id)
         
         if isinstance(result, tuple):
             return result[0]  # Return just the summary for streamlit
@@ -193,7 +432,37 @@ def get_summary_length():
     except KeyboardInterrupt:
         return 0.3
 
-def summarize_single_video(nlp, last_summary_storage):
+def load_nlp_in_background():
+    """Load the spaCy model on a daemon thread, returning a Future for it"""
+    # A daemon thread (unlike an executor worker) is not joined at exit,
+    # so quitting right after launch doesn't wait for the model to load
+    nlp_future = Future()
+    
+    def load():
+        try:
+            nlp_future.set_result(load_nlp_model(verbose=False))
+        except Exception as e:
+            nlp_future.set_exception(e)
+    
+    threading.Thread(target=load, daemon=True).start()
+    return nlp_future
+
+def wait_for_nlp(nlp_future):
+    """Wait for the background model load, reporting if it failed"""
+    try:
+        nlp = nlp_future.result()
+    except Exception as e:
+        print(f"❌ spaCy English model could not be loaded: {e}")
+        print("Reinstall with: python -m spacy download en_core_web_sm")
+        input("Press Enter to continue...")
+        return None
+    if not nlp:
+        print("❌ spaCy English model not found!")
+        print("Install with: python -m spacy download en_core_web_sm")
+        input("Press Enter to continue...")
+    return nlp
+
+def summarize_single_video(nlp_future, last_summary_storage, n_process=1):
     """Handle single video summarization"""
     print("\n" + "="*50)
     print("📺 SINGLE VIDEO SUMMARIZATION")
@@ -226,7 +495,10 @@ def summarize_single_video(nlp, last_summary_storage):
         return
     
     # Summarize
-    result = summarize_text(text, nlp, summary_length)
+    nlp = wait_for_nlp(nlp_future)
+    if not nlp:
+        return
+    result = summarize_text(text, nlp, summary_length, n_process, video_id)
     
     if isinstance(result, tuple):
         summary, sentences = result
@@ -288,7 +560,41 @@ def show_all_sentences(sentences):
     
     print(f"\n📊 Total sentences: {len(sentences)}")
 
-def batch_summarize(nlp):
+def summarize_transcripts(transcripts, nlp, summary_length, n_process=1):
+    """Summarize (result index, video ID, transcript) entries, keyed by index"""
+    # Only parse videos that are neither cached nor repeated in this batch
+    parsed = {}
+    to_parse = {}
+    for _, video_id, text in transcripts:
+        if video_id in parsed or video_id in to_parse:
+            continue
+        cached = load_cached_docs(video_id, nlp)
+        if cached is None:
+            to_parse[video_id] = transcript_chunks(text)
+        else:
+            parsed[video_id] = cached
+    if parsed:
+        print(f"Reusing cached parse for {len(parsed)} video(s)...")
+    
+    # Parse the rest in one batched pipe, tagging chunks with their
+    # video ID so they can be regrouped per video
+    chunks = ((chunk, video_id) for video_id, video_chunks in to_parse.items()
+              for chunk in video_chunks)
+    docs = nlp.pipe(chunks, as_tuples=True, batch_size=BATCH_SIZE,
+                    n_process=n_process, disable=UNUSED_PIPES)
+    for i, (video_id, group) in enumerate(groupby(docs, key=itemgetter(1)), 1):
+        print(f"Processing video {i}/{len(to_parse)}...")
+        parsed[video_id] = ([doc for doc, _ in group], to_parse[video_id])
+        save_cached_docs(video_id, nlp, *parsed[video_id])
+    
+    summaries = {}
+    for index, video_id, _ in transcripts:
+        docs, chunks = parsed.get(video_id, ([], []))
+        result = summarize_docs(docs, summary_length, chunks)
+        summaries[index] = result[0] if isinstance(result, tuple) else result
+    return summaries
+
+def batch_summarize(nlp_future, n_process=1):
     """Handle batch summarization of multiple videos"""
     print("\n" + "="*50)
     print("📊 BATCH SUMMARIZATION")
@@ -312,25 +618,38 @@ def batch_summarize(nlp):
     
     print(f"\n🔄 Processing {len(urls)} videos...")
     
+    # Transcript downloads are network-bound, so fetch them concurrently
+    print("Fetching transcripts...")
+    video_ids = [extract_video_id(url) for url in urls]
+    
+    # Fetch each distinct video once; repeated URLs share the transcript
+    unique_ids = list(dict.fromkeys(video_id for video_id in video_ids if video_id))
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        fetched = dict(zip(unique_ids, executor.map(get_video_transcript, unique_ids)))
+    
     results = []
-    for i, url in enumerate(urls, 1):
-        print(f"Processing video {i}/{len(urls)}...")
-        
-        video_id = extract_video_id(url)
+    transcripts = []
+    for i, (url, video_id) in enumerate(zip(urls, video_ids)):
         if not video_id:
             results.append((url, "Invalid URL"))
             continue
         
-        text = get_video_transcript(video_id)
+        text = fetched[video_id]
         if not text:
             results.append((url, "No transcript available"))
             continue
         
-        result = summarize_text(text, nlp, summary_length)
-        if isinstance(result, tuple):
-            results.append((url, result[0]))
-        else:
-            results.append((url, result))
+        results.append((url, None))
+        transcripts.append((i, video_id, text))
+    
+    nlp = wait_for_nlp(nlp_future)
+    if nlp:
+        summaries = summarize_transcripts(transcripts, nlp, summary_length, n_process)
+    else:
+        summaries = {index: "Error: spaCy English model not available"
+                     for index, _, _ in transcripts}
+    for index, summary in summaries.items():
+        results[index] = (urls[index], summary)
     
     # Display results
     print("\n" + "="*50)
@@ -385,31 +704,33 @@ def view_last_summary(last_summary_storage):
     
     input("\nPress Enter to continue...")
 
-def show_settings():
+def show_settings(nlp_future):
     """Show application settings and info"""
     print("\n" + "="*50)
     print("⚙️ SETTINGS & INFO")
     print("="*50)
     
-    # Check spaCy model
-    try:
-        nlp = spacy.load('en_core_web_sm')
+    # Check the shared spaCy model instead of loading another copy
+    if not nlp_future.done():
+        print("⏳ spaCy English model: Loading...")
+    elif nlp_future.exception() is not None:
+        print(f"❌ spaCy English model: Failed to load ({nlp_future.exception()})")
+        print("   Reinstall with: python -m spacy download en_core_web_sm")
+    elif nlp_future.result() is not None:
         print("✅ spaCy English model: Loaded")
-    except:
+    else:
         print("❌ spaCy English model: Not found")
         print("   Install with: python -m spacy download en_core_web_sm")
     
     # Check other dependencies
-    try:
-        import pytube
+    if find_spec('pytube') is not None:
         print("✅ pytube: Available")
-    except:
+    else:
         print("❌ pytube: Not available")
     
-    try:
-        import youtube_transcript_api
+    if find_spec('youtube_transcript_api') is not None:
         print("✅ youtube_transcript_api: Available")
-    except:
+    else:
         print("❌ youtube_transcript_api: Not available")
     
     print(f"\n📋 Current settings:")
@@ -440,6 +761,8 @@ HOW TO USE:
 SUPPORTED URLs:
 - https://www.youtube.com/watch?v=VIDEO_ID
 - https://youtu.be/VIDEO_ID
+- https://www.youtube.com/shorts/VIDEO_ID
+- https://www.youtube.com/embed/VIDEO_ID
 - Any standard YouTube video URL
 
 REQUIREMENTS:
@@ -464,15 +787,14 @@ educational content typically produces better summaries.
     
     input("Press Enter to continue...")
 
-def main_cli():
+def main_cli(n_process=1):
     """Main CLI application loop"""
     global STREAMLIT_MODE
     STREAMLIT_MODE = False
     
-    # Check if spaCy model is available
-    nlp = load_nlp_model()
-    if not nlp:
-        return
+    # Load the spaCy model in the background while the user navigates
+    # the menu; it is only waited on once a transcript needs parsing
+    nlp_future = load_nlp_in_background()
     
     last_summary_storage = {}
     
@@ -484,13 +806,13 @@ def main_cli():
         choice = get_user_choice()
         
         if choice == '1':
-            summarize_single_video(nlp, last_summary_storage)
+            summarize_single_video(nlp_future, last_summary_storage, n_process)
         elif choice == '2':
-            batch_summarize(nlp)
+            batch_summarize(nlp_future, n_process)
         elif choice == '3':
             view_last_summary(last_summary_storage)
         elif choice == '4':
-            show_settings()
+            show_settings(nlp_future)
         elif choice == '5':
             show_help()
         elif choice == '6':
@@ -582,9 +904,12 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='YouTube Video Summarizer')
     parser.add_argument('--cli', action='store_true', 
                        help='Run in command-line interface mode')
+    parser.add_argument('--n-process', type=int, default=1,
+                       help='Number of processes spaCy uses to parse transcripts '
+                            '(only worth raising for long transcripts or batches)')
     args = parser.parse_args()
     
     if args.cli:
-        main_cli()
+        main_cli(max(1, args.n_process))
     else:
         main()
\ No newline at end of file